@@ -0,0 +1,36 @@
+import copy
+
+from rest_framework import serializers
+
+# Field instances built by ModelSerializer.get_fields(), per serializer class
+_fields_cache = {}
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields from its Meta once per class instead of on
+    every instantiation, and hand each instance its own copies.
+    Only for serializers whose fields don't depend on the instance or context.
+    """
+
+    def get_fields(self):
+        serializer_class = type(self)
+        if serializer_class not in _fields_cache:
+            _fields_cache[serializer_class] = super().get_fields()
+
+        # Deep copy so nested serializers aren't shared (and bound) across instances
+        return copy.deepcopy(_fields_cache[serializer_class])
+
+
+class ChoiceDisplayField(serializers.ReadOnlyField):
+    """
+    Read-only display label for a choices column, looked up in a dict built once
+    instead of calling get_FOO_display() (which rebuilds the choices dict) per row
+    """
+
+    def __init__(self, choices, **kwargs):
+        self.choice_labels = dict(choices)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.choice_labels.get(value, value)
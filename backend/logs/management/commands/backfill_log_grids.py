@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from logs.models import DailyLog
+from logs.services import paint_daily_log_grid
+
+
+class Command(BaseCommand):
+    help = "Store the ELD grid for daily logs generated before it was saved alongside their entries"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, batch_size, **options):
+        daily_logs = DailyLog.objects.filter(log_grid_data__isnull=True).only('id')
+
+        batch = []
+        updated = 0
+        for daily_log in daily_logs.iterator(chunk_size=batch_size):
+            daily_log.log_grid_data = paint_daily_log_grid(daily_log)
+            # Logs without entries have nothing to paint, leave them empty
+            if daily_log.log_grid_data is None:
+                continue
+
+            batch.append(daily_log)
+            if len(batch) >= batch_size:
+                updated += DailyLog.objects.bulk_update(batch, ['log_grid_data'])
+                batch = []
+
+        if batch:
+            updated += DailyLog.objects.bulk_update(batch, ['log_grid_data'])
+
+        self.stdout.write(self.style.SUCCESS(f"Stored the grid for {updated} daily logs"))
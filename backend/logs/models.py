@@ -81,6 +81,9 @@ class LogEntry(models.Model):
 
     class Meta:
         ordering = ['daily_log', 'start_time']
+        indexes = [
+            models.Index(fields=['daily_log', 'start_time']),
+        ]
 
     def __str__(self):
         return f"{self.get_duty_status_display()} - {self.start_time.strftime('%H:%M')}"
\ No newline at end of file
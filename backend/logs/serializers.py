@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from core.serializers import ChoiceDisplayField
 from logs.models import DailyLog, LogEntry
+from logs.services import get_daily_log_grid
 
 
 class LogEntrySerializer(serializers.ModelSerializer):
-    duty_status_display = serializers.CharField(source='get_duty_status_display', read_only=True)
+    duty_status_display = ChoiceDisplayField(LogEntry.DUTY_STATUS_CHOICES, source='duty_status')
 
     class Meta:
         model = LogEntry
@@ -15,6 +17,7 @@ class LogEntrySerializer(serializers.ModelSerializer):
 
 class DailyLogSerializer(serializers.ModelSerializer):
     entries = LogEntrySerializer(many=True, read_only=True)
+    log_grid_data = serializers.SerializerMethodField()
 
     class Meta:
         model = DailyLog
@@ -22,12 +25,15 @@ class DailyLogSerializer(serializers.ModelSerializer):
             'id', 'day_number', 'log_date',
             'total_driving_hours', 'total_on_duty_hours',
             'total_off_duty_hours', 'start_location',
-            'end_location', 'total_miles', 'entries'
+            'end_location', 'total_miles', 'log_grid_data', 'entries'
         ]
 
+    def get_log_grid_data(self, obj):
+        return get_daily_log_grid(obj)
+
 
 class DailyLogListSerializer(serializers.ModelSerializer):
-    entries = LogEntrySerializer(many=True, read_only=True)  # Add this line
+    log_grid_data = serializers.SerializerMethodField()
 
     class Meta:
         model = DailyLog
@@ -42,5 +48,8 @@ class DailyLogListSerializer(serializers.ModelSerializer):
             'end_location',
             'total_miles',
             'is_compliant',
-            'entries'
+            'log_grid_data'
         ]
+
+    def get_log_grid_data(self, obj):
+        return get_daily_log_grid(obj)
@@ -0,0 +1,76 @@
+# logs/services.py
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import DailyLog, LogEntry
+
+SLOTS_PER_DAY = 96
+SLOT_LENGTH = timedelta(minutes=15)
+SLOTS_PER_HOUR = SLOTS_PER_DAY // 24
+
+# Small-int code per duty status, off duty is code 0 so an empty grid reads as off duty
+DUTY_STATUS_NAMES = [status for status, _ in LogEntry.DUTY_STATUS_CHOICES]
+DUTY_STATUS_CODES = {status: code for code, status in enumerate(DUTY_STATUS_NAMES)}
+
+
+def get_log_grid(entries: Iterable[Tuple[datetime, datetime, str]], day_start: datetime) -> List[str]:
+    """
+    Paint the 24-hour ELD grid (15-minute intervals) for one day of log entries,
+    given as (start_time, end_time, duty_status) tuples, e.g. straight from
+    values_list() so no model instances are built.
+    Later entries win on slots they share with earlier ones.
+    """
+    grid = bytearray(SLOTS_PER_DAY)
+
+    for start_time, end_time, duty_status in entries:
+        # timedelta // timedelta is exact integer math; negating both sides gives the ceiling
+        start_idx = max((start_time - day_start) // SLOT_LENGTH, 0)
+        end_idx = min(-((day_start - end_time) // SLOT_LENGTH), SLOTS_PER_DAY)
+
+        # Slice assignment fills the whole run in one go instead of slot by slot
+        if end_idx > start_idx:
+            code = DUTY_STATUS_CODES[duty_status]
+            grid[start_idx:end_idx] = bytes((code,)) * (end_idx - start_idx)
+
+    return [DUTY_STATUS_NAMES[code] for code in grid]
+
+
+def paint_daily_log_grid(daily_log: DailyLog) -> Optional[List[str]]:
+    """
+    Paint a daily log's grid from its stored entries, None for a log without entries
+    """
+    entries = list(daily_log.entries.values_list('start_time', 'end_time', 'duty_status'))
+    if not entries:
+        return None
+
+    # Entries are ordered by start time and the first one always opens the day
+    return get_log_grid(entries, entries[0][0])
+
+
+def get_daily_log_grid(daily_log: DailyLog) -> Optional[List[str]]:
+    """
+    Return the stored grid for a daily log. Logs generated before the grid was
+    written alongside the entries get it painted in memory, nothing is saved on
+    read (run the backfill_log_grids command to store theirs).
+    """
+    if daily_log.log_grid_data is not None:
+        return daily_log.log_grid_data
+
+    return paint_daily_log_grid(daily_log)
+
+
+def get_hourly_summary(grid: List[str]) -> List[Dict[str, int]]:
+    """
+    Minutes spent in each duty status for every hour of the day, folded from
+    the stored 15-minute grid so no entries have to be read
+    """
+    slot_minutes = SLOT_LENGTH // timedelta(minutes=1)
+    summary = []
+
+    for hour in range(24):
+        minutes = dict.fromkeys(DUTY_STATUS_NAMES, 0)
+        for status in grid[hour * SLOTS_PER_HOUR:(hour + 1) * SLOTS_PER_HOUR]:
+            minutes[status] += slot_minutes
+        summary.append({'hour': hour, **minutes})
+
+    return summary
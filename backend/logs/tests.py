@@ -1,3 +1,97 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+import zoneinfo
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from trips.models import Trip
+from logs.models import DailyLog, LogEntry
+from logs.serializers import DailyLogListSerializer
+
+
+class DailyLogGridTests(TestCase):
+
+    def setUp(self):
+        self.trip = Trip.objects.create(
+            trip_name='Test trip',
+            current_location_address='Current',
+            pickup_location_address='Pickup',
+            dropoff_location_address='Dropoff',
+            current_cycle_hours_used=0
+        )
+        # A log generated before the grid was stored with it
+        self.daily_log = self.create_daily_log([('off_duty', 0, 6), ('driving', 6, 12), ('off_duty', 12, 24)])
+
+    def create_daily_log(self, entries, day_number=1):
+        # entries are (duty_status, start hour, end hour) on the log's day in Asia/Amman
+        daily_log = DailyLog.objects.create(
+            trip=self.trip, day_number=day_number, log_date=date(2025, 1, day_number),
+            total_driving_hours=6, total_on_duty_hours=6, total_off_duty_hours=18,
+            start_location='Current', end_location='Dropoff', total_miles=300
+        )
+        day_start = datetime(2025, 1, day_number, tzinfo=zoneinfo.ZoneInfo('Asia/Amman'))
+        for duty_status, start_hour, end_hour in entries:
+            LogEntry.objects.create(
+                daily_log=daily_log, duty_status=duty_status,
+                start_time=day_start + timedelta(hours=start_hour),
+                end_time=day_start + timedelta(hours=end_hour),
+                duration_minutes=round((end_hour - start_hour) * 60),
+                location='Somewhere'
+            )
+        return daily_log
+
+    def test_serializing_paints_the_grid_without_saving(self):
+        with CaptureQueriesContext(connection) as queries:
+            grid = DailyLogListSerializer(self.daily_log).data['log_grid_data']
+
+        self.assertEqual(grid[:24], ['off_duty'] * 24)
+        self.assertEqual(grid[24:48], ['driving'] * 24)
+        self.assertTrue(all(query['sql'].startswith('SELECT') for query in queries.captured_queries))
+        self.daily_log.refresh_from_db()
+        self.assertIsNone(self.daily_log.log_grid_data)
+
+    def test_backfill_stores_the_grid(self):
+        expected = DailyLogListSerializer(self.daily_log).data['log_grid_data']
+
+        call_command('backfill_log_grids', stdout=StringIO())
+
+        self.daily_log.refresh_from_db()
+        self.assertEqual(self.daily_log.log_grid_data, expected)
+
+    def test_hourly_summary_of_a_partly_driving_hour(self):
+        daily_log = self.create_daily_log(
+            [('off_duty', 0, 6.5), ('driving', 6.5, 12.25), ('on_duty', 12.25, 13), ('off_duty', 13, 24)],
+            day_number=2
+        )
+
+        response = self.client.get(f'/api/daily-logs/{daily_log.pk}/hourly/')
+
+        self.assertEqual(response.status_code, 200)
+        summary = response.json()
+        self.assertEqual(len(summary), 24)
+        self.assertEqual(summary[6], {'hour': 6, 'off_duty': 30, 'sleeper': 0, 'driving': 30, 'on_duty': 0})
+        self.assertEqual(summary[12], {'hour': 12, 'off_duty': 0, 'sleeper': 0, 'driving': 15, 'on_duty': 45})
+        for hour in summary:
+            self.assertEqual(hour['off_duty'] + hour['sleeper'] + hour['driving'] + hour['on_duty'], 60)
+
+    def test_hourly_summary_of_a_log_without_entries(self):
+        daily_log = self.create_daily_log([], day_number=2)
+
+        response = self.client.get(f'/api/daily-logs/{daily_log.pk}/hourly/')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_hourly_summary_without_a_stored_grid(self):
+        response = self.client.get(f'/api/daily-logs/{self.daily_log.pk}/hourly/')
+        self.assertEqual(response.status_code, 200)
+
+        call_command('backfill_log_grids', stdout=StringIO())
+        self.daily_log.refresh_from_db()
+        self.assertIsNotNone(self.daily_log.log_grid_data)
 
-# Create your tests here.
+        stored_response = self.client.get(f'/api/daily-logs/{self.daily_log.pk}/hourly/')
+        self.assertEqual(stored_response.json(), response.json())
+        self.assertEqual(response.json()[6]['driving'], 60)
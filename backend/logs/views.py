@@ -1,10 +1,18 @@
+from django.db.models import Prefetch
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from django.http import JsonResponse
 
 from .models import DailyLog, LogEntry
 from .serializers import DailyLogSerializer, DailyLogListSerializer, LogEntrySerializer
+from .services import get_daily_log_grid, get_hourly_summary
+
+# Entry columns LogEntrySerializer reads
+ENTRY_FIELDS = (
+    'id', 'duty_status', 'start_time', 'end_time',
+    'duration_minutes', 'location', 'remarks'
+)
 
 
 class DailyLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -12,10 +20,19 @@ class DailyLogViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /api/daily-logs/ - List all daily logs
     - GET /api/daily-logs/{id}/ - Get daily log details
     - GET /api/daily-logs/{id}/export/ - Export log as PDF/JSON
+    - GET /api/daily-logs/{id}/hourly/ - Minutes per duty status for each hour
     - GET /api/daily-logs/?trip={trip_id} - Filter logs by trip
     """
 
-    queryset = DailyLog.objects.all().select_related('trip').prefetch_related('entries')
+    queryset = DailyLog.objects.all()
+
+    # Columns DailyLogListSerializer actually reads
+    LIST_FIELDS = [
+        'id', 'day_number', 'log_date',
+        'total_driving_hours', 'total_on_duty_hours', 'total_off_duty_hours',
+        'start_location', 'end_location', 'total_miles',
+        'is_compliant', 'log_grid_data'
+    ]
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -25,6 +42,16 @@ class DailyLogViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
 
+        # The list view renders the stored grid, so it needs neither the entries
+        # nor the remaining columns (violations, created_at, ...)
+        if self.action == 'list':
+            queryset = queryset.only(*self.LIST_FIELDS)
+        elif self.action in ('retrieve', 'export'):
+            # Skip the entry columns the detail view never renders (lat/lng, created_at)
+            queryset = queryset.prefetch_related(
+                Prefetch('entries', queryset=LogEntry.objects.only('daily_log', *ENTRY_FIELDS))
+            )
+
         # Filter by trip if provided
         trip_id = self.request.query_params.get('trip', None)
         if trip_id:
@@ -38,6 +65,7 @@ class DailyLogViewSet(viewsets.ReadOnlyModelViewSet):
         format_type = request.query_params.get('format', 'json')
 
         if format_type == 'json':
+            # Same representation as the detail view, entries come from the prefetch above
             serializer = DailyLogSerializer(daily_log)
             return Response(serializer.data)
 
@@ -54,13 +82,33 @@ class DailyLogViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=True, methods=['get'])
+    def hourly(self, request, pk=None):
+        daily_log = self.get_object()
+        grid = get_daily_log_grid(daily_log)
+
+        if grid is None:
+            return Response(
+                {'error': 'No log entries recorded for this day'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response(get_hourly_summary(grid))
+
+
+class LogEntryPagination(CursorPagination):
+    # Keyset pagination on the primary key, no OFFSET scans on deep pages
+    page_size = 100
+    ordering = 'id'
+
 
 class LogEntryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Endpoints:
-    - GET /api/log-entries/ - List all log entries
+    - GET /api/log-entries/ - List all log entries (cursor paginated)
     - GET /api/log-entries/{id}/ - Get log entry details
     """
 
-    queryset = LogEntry.objects.all().select_related('daily_log')
-    serializer_class = LogEntrySerializer
\ No newline at end of file
+    queryset = LogEntry.objects.all()
+    serializer_class = LogEntrySerializer
+    pagination_class = LogEntryPagination
\ No newline at end of file
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.serializers import CachedFieldsMixin, ChoiceDisplayField
 from routes.models import Route, Stop
 
 
@@ -8,9 +9,9 @@ class LocationSerializer(serializers.Serializer):
     longitude = serializers.FloatField()
 
 
-class StopSerializer(serializers.ModelSerializer):
+class StopSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     location = serializers.SerializerMethodField()
-    stop_type_display = serializers.CharField(source='get_stop_type_display', read_only=True)
+    stop_type_display = ChoiceDisplayField(Stop.STOP_TYPE_CHOICES, source='stop_type')
 
     class Meta:
         model = Stop
@@ -36,7 +37,7 @@ class StopSerializer(serializers.ModelSerializer):
         }
 
 
-class RouteSerializer(serializers.ModelSerializer):
+class RouteSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     stops = StopSerializer(many=True, read_only=True)
 
     class Meta:
@@ -50,33 +51,23 @@ class RouteSerializer(serializers.ModelSerializer):
             'total_off_duty_hours',
             'compliance_status',
             'compliance_notes',
-            'mapbox_route_geometry',
             'stops',
             'created_at'
         ]
 
 
-class RouteDetailSerializer(serializers.ModelSerializer):
-    stops = StopSerializer(many=True, read_only=True)
+class RouteDetailSerializer(RouteSerializer):
+    """Route with the trip's name and addresses alongside the route fields"""
     trip_name = serializers.CharField(source='trip.trip_name', read_only=True)
     pickup_location_address = serializers.CharField(source='trip.pickup_location_address', read_only=True)
     dropoff_location_address = serializers.CharField(source='trip.dropoff_location_address', read_only=True)
 
-    class Meta:
-        model = Route
+    class Meta(RouteSerializer.Meta):
+        # Trip fields go right after the id
         fields = [
             'id',
             'trip_name',
             'pickup_location_address',
             'dropoff_location_address',
-            'total_distance_miles',
-            'total_duration_hours',
-            'total_driving_hours',
-            'total_on_duty_hours',
-            'total_off_duty_hours',
-            'compliance_status',
-            'compliance_notes',
-            'mapbox_route_geometry',
-            'stops',
-            'created_at'
-        ]
\ No newline at end of file
+            *RouteSerializer.Meta.fields[1:]
+        ]
@@ -1,23 +1,53 @@
 # routes/services.py
-import json
+import hashlib
+import heapq
+import math
+import threading
 import zoneinfo
-from asyncio import timeout
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from webbrowser import open_new
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import itemgetter
 
+import orjson
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from trips.models import Trip
 from .models import Route, Stop
 from logs.models import DailyLog, LogEntry
+from logs.services import get_log_grid
 import logging
-from logs.models import LogEntry
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_MILES = 3958.8
+
+# Shared worker threads for concurrent MapBox lookups, created once instead of per request
+mapbox_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='mapbox')
+
+# Stop types whose time on the log counts as on duty (not driving)
+ON_DUTY_STOP_TYPES = frozenset({'pickup', 'dropoff', 'fuel'})
+# Stop types the route's driving total is measured between
+ROUTE_ENDPOINT_STOP_TYPES = frozenset({'current', 'pickup', 'dropoff'})
+BREAK_STOP_TYPES = frozenset({'30min_break', '10hr_break'})
+# Log entry duty status for the time spent at each stop type, anything else is off duty
+STOP_DUTY_STATUS = {
+    'pickup': 'on_duty',
+    'dropoff': 'on_duty',
+    'fuel': 'on_duty',
+    '30min_break': 'off_duty',
+    '10hr_break': 'sleeper',
+    'current': 'off_duty'
+}
+
 # HOS Rules Configuration
 class HOSRules:
     MAX_DRIVING_HOURS_PER_DAY = 11
@@ -27,6 +57,8 @@ class HOSRules:
     REQUIRED_30MIN_BREAK_AFTER_HOURS = 8
     REQUIRED_OFF_DUTY_HOURS = 10
     AVERAGE_SPEED_MPH = 55
+    # How far over the available hours a straight-line estimate must be to reject without routing
+    FEASIBILITY_ESTIMATE_MARGIN = 1.5
     FUEL_STOP_INTERVAL_MILES = 1000
     FUEL_STOP_DURATION_MINUTES = 30
     BREAK_30MIN_DURATION = 30
@@ -35,31 +67,157 @@ class HOSRules:
     DROPOFF_DURATION_MINUTES = 60
 
 
+@dataclass(slots=True)
+class PlannedStop:
+    # A stop in the generated plan, before it is saved as a Stop row
+    sequence: int
+    stop_type: str
+    address: str
+    latitude: float
+    longitude: float
+    arrival_time: datetime
+    departure_time: datetime
+    duration_minutes: int
+    description: str
+    place_id: str
+    cumulative_miles: float
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    # Great-circle distance between two points
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[List[float]]:
+    # Decode an encoded polyline into GeoJSON-ordered [lng, lat] points
+    factor = 10 ** precision
+    coordinates = []
+    index = lat = lng = 0
+
+    while index < len(encoded):
+        # Each point is a (lat, lng) pair of zigzag varint deltas from the previous point
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+
+        lat += deltas[0]
+        lng += deltas[1]
+        coordinates.append([lng / factor, lat / factor])
+
+    return coordinates
+
+
+def iter_day_spans(start: datetime, end: datetime) -> Iterator[Tuple[date, datetime, datetime]]:
+    # Split start..end at midnight (in start's zone) into (date, clipped start, clipped end) per day
+    tzinfo = start.tzinfo
+    current_date = start.date()
+    end_date = end.date()
+
+    while current_date <= end_date:
+        day_start = datetime.combine(current_date, datetime.min.time(), tzinfo)
+        day_end = datetime.combine(current_date, datetime.max.time(), tzinfo)
+        yield current_date, max(start, day_start), min(end, day_end)
+        current_date += timedelta(days=1)
+
+
+@dataclass(slots=True)
+class RoutePath:
+    # Route polyline ([lng, lat] points) with the running distance in miles to each point
+    coordinates: List[List[float]]
+    cumulative_miles: List[float]
+
+    @classmethod
+    def from_geometry(cls, geometry: Dict) -> 'RoutePath':
+        coordinates = geometry['coordinates']
+        cumulative_miles = [0.0]
+        for prev_point, next_point in zip(coordinates, coordinates[1:]):
+            cumulative_miles.append(
+                cumulative_miles[-1] + haversine_miles(prev_point[1], prev_point[0], next_point[1], next_point[0])
+            )
+        return cls(coordinates, cumulative_miles)
+
+    def from_fraction(self, fraction: float) -> 'RoutePath':
+        # The rest of the path past the given share of its length, distances counted from there
+        index = max(bisect_right(self.cumulative_miles, fraction * self.cumulative_miles[-1]) - 1, 0)
+        start_miles = self.cumulative_miles[index]
+        return RoutePath(
+            self.coordinates[index:],
+            [miles - start_miles for miles in self.cumulative_miles[index:]]
+        )
+
+
 class MapBoxService:
     # todo proper bug handling for api errors
 
     BASE_URL = "https://api.mapbox.com"
 
+    # (connect, read) seconds, so a stalled MapBox call can't hang route generation
+    REQUEST_TIMEOUT = (3, 10)
+
+    # Cache lifetimes: directions and nearby places rarely change, an address's location even less
+    ROUTE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+    POI_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+    GEOCODE_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
     def __init__(self):
         self.access_token = settings.MAPBOX_ACCESS_TOKEN
 
+        # Rate limits and transient server errors are retried too, not just dropped connections.
+        # Always on the short backoff: urllib3 would otherwise sleep for whatever Retry-After says
+        retry = Retry(
+            total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=False
+        )
+        # One connection pool shared by every thread, so MapBox calls reuse keep-alive connections.
+        # urllib3's pools are thread-safe, requests.Session isn't documented to be, so each thread
+        # gets its own session mounted on this adapter
+        self.adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount('https://', self.adapter)
+        return session
+
     def geocode_address(self, address: str) -> Tuple[float, float]:
         """Convert address to lat/lng"""
+        # Case and spacing don't change where an address is
+        normalized_address = ' '.join(address.lower().split())
+        cache_key = 'mapbox:geocode:' + hashlib.blake2b(normalized_address.encode(), digest_size=16).hexdigest()
+        cached_coordinates = cache.get(cache_key)
+        if cached_coordinates is not None:
+            return cached_coordinates
+
         url = f"{self.BASE_URL}/geocoding/v5/mapbox.places/{address}.json"
         params = {
             'access_token': self.access_token,
             'limit': 1
         }
 
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         if not data.get('features'):
             raise ValueError(f"Could not geocode address: {address}")
 
         coordinates = data['features'][0]['geometry']['coordinates']
-        return coordinates[1], coordinates[0]  # lat, lng
+        lat_lng = (coordinates[1], coordinates[0])
+        cache.set(cache_key, lat_lng, self.GEOCODE_CACHE_TIMEOUT)
+        return lat_lng
 
     def get_route(self, waypoints: List[Tuple[float, float]]) -> Dict:
         """
@@ -69,17 +227,22 @@ class MapBoxService:
         # Format: lng,lat;lng,lat;lng,lat
         coordinates = ';'.join([f"{lng},{lat}" for lat, lng in waypoints])
 
+        cache_key = 'mapbox:route:' + hashlib.blake2b(coordinates.encode(), digest_size=16).hexdigest()
+        cached_route = cache.get(cache_key)
+        if cached_route is not None:
+            return cached_route
+
         url = f"{self.BASE_URL}/directions/v5/mapbox/driving/{coordinates}"
         params = {
             'access_token': self.access_token,
-            'geometries': 'geojson',
-            'overview': 'full',
-            'steps': 'true'
+            # Encoded polyline at 1e-6 precision, far smaller than GeoJSON coordinate arrays
+            'geometries': 'polyline6',
+            'overview': 'full'
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = self.session.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         if not data.get('routes'):
             raise ValueError("No route found")
@@ -90,14 +253,45 @@ class MapBoxService:
         distance_miles = route['distance'] * 0.000621371
         duration_hours = route['duration'] / 3600
 
-        return {
+        route_result = {
             'distance_miles': distance_miles,
             'duration_hours': duration_hours,
-            'geometry': route['geometry'],
-            'legs': route['legs']
+            'geometry': {
+                'type': 'LineString',
+                'coordinates': decode_polyline(route['geometry'], precision=6)
+            },
+            # Turn-by-turn steps aren't requested, only the per-leg totals are used
+            'legs': [
+                {'distance': leg['distance'], 'duration': leg['duration']}
+                for leg in route['legs']
+            ]
         }
+        cache.set(cache_key, route_result, self.ROUTE_CACHE_TIMEOUT)
+
+        return route_result
 
     def find_nearest_stop_location(self, lat: float, lng: float, stop_type: str) -> Optional[Dict]:
+        # Stops planned within ~1 km of each other resolve to the same place, share the lookup
+        cache_key = f"mapbox:poi:{stop_type}:{lat:.2f},{lng:.2f}"
+        stop_location = cache.get(cache_key)
+        if stop_location is not None:
+            return stop_location
+
+        stop_location = self._search_stop_location(lat, lng, stop_type)
+        if stop_location is None:
+            # Ultimate fallback, left uncached so a later lookup can still find a real place
+            logger.warning(f"No location found for {stop_type} at ({lat}, {lng}), using coordinates")
+            return {
+                'address': f"Rest Stop (estimated near {lat:.4f}, {lng:.4f})",
+                'latitude': lat,
+                'longitude': lng,
+                'place_id': ''
+            }
+
+        cache.set(cache_key, stop_location, self.POI_CACHE_TIMEOUT)
+        return stop_location
+
+    def _search_stop_location(self, lat: float, lng: float, stop_type: str) -> Optional[Dict]:
 
         # Find nearest rest area, gas station, or parking near a coordinate
 
@@ -135,9 +329,9 @@ class MapBoxService:
                 'language': 'en'
             }
             try:
-                response = requests.get(url, params=params)
+                response = self.session.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
                 response.raise_for_status()
-                data = response.json()
+                data = orjson.loads(response.content)
 
                 logger.info(f"Mapbox search for '{query}' at ({lat}, {lng}): {len(data.get('features', []))} results")
 
@@ -155,7 +349,8 @@ class MapBoxService:
                         'place_id': feature.get('id', '')
                     }
 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+                # A body that isn't JSON (an HTML error page) is skipped like a failed request
                 logger.error(f"Mapbox API error for query '{query}': {e}")
                 continue
 
@@ -167,9 +362,9 @@ class MapBoxService:
                 'types': 'place,locality',
                 'limit': 1
             }
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if data.get('features'):
                 location_name = data['features'][0].get('place_name', 'Unknown location')
@@ -191,37 +386,50 @@ class MapBoxService:
         except Exception as e:
             logger.error(f"Reverse geocoding failed: {e}")
 
-        # Ultimate fallback
-        logger.warning(f"No location found for {stop_type} at ({lat}, {lng}), using coordinates")
-        return {
-            'address': f"Rest Stop (estimated near {lat:.4f}, {lng:.4f})",
-            'latitude': lat,
-            'longitude': lng,
-            'place_id': ''
-        }
+        return None
 
-    def get_point_along_route(self, geometry: Dict, distance_miles: float, total_distance_miles: float) -> Tuple[float, float]:
+    def get_point_along_route(self, path: 'RoutePath', distance_miles: float, total_distance_miles: float) -> Tuple[float, float]:
         # Get lat/lng at a specific distance along the route
-        coordinates = geometry['coordinates']
+        coordinates = path.coordinates
+        cumulative_miles = path.cumulative_miles
 
-        fraction = distance_miles / total_distance_miles  # Calculate the fraction of the route
+        # Scale the road distance onto the polyline's own length, points aren't evenly spaced
+        target_miles = distance_miles / total_distance_miles * cumulative_miles[-1]
+        index = bisect_left(cumulative_miles, target_miles)
 
-        total_points = len(coordinates)
-        target_index = int(fraction * (total_points - 1))
+        if index == 0:
+            point = coordinates[0]
+            return point[1], point[0]  # lat, lng
+        if index >= len(coordinates):
+            point = coordinates[-1]
+            return point[1], point[0]
 
-        if target_index >= total_points:
-            target_index = total_points - 1
+        # Interpolate inside the segment the target falls in
+        segment_start = cumulative_miles[index - 1]
+        segment_miles = cumulative_miles[index] - segment_start
+        ratio = (target_miles - segment_start) / segment_miles if segment_miles else 0
+        prev_point, next_point = coordinates[index - 1], coordinates[index]
 
-        point = coordinates[target_index]
-        return point[1], point[0]  # lat, lng
+        lat = prev_point[1] + (next_point[1] - prev_point[1]) * ratio
+        lng = prev_point[0] + (next_point[0] - prev_point[0]) * ratio
+        return lat, lng
+
+
+# Shared by every generation run, so the pooled keep-alive connections outlive a single trip
+mapbox_service = MapBoxService()
 
 
 class RouteGenerationService:
 
     def __init__(self, trip: Trip):
         self.trip = trip
-        self.mapbox = MapBoxService()  # No parameters needed
-        self.stops = []
+        self.mapbox = mapbox_service
+        self.base_route: Optional[Dict] = None
+        # Trip fields changed during generation, saved together by _save_trip()
+        self.trip_update_fields = set()
+        self.stops: List[PlannedStop] = []
+        # Planned breaks and fuel stops still waiting on a nearby place, with the search type
+        self.pending_locations: List[Tuple[PlannedStop, str]] = []
 
         # Set timezone based on user location (Jordan = Asia/Amman)
         self.timezone = zoneinfo.ZoneInfo('Asia/Amman')
@@ -229,8 +437,7 @@ class RouteGenerationService:
         # Ensure start time is timezone-aware
         if trip.planned_start_time.tzinfo is None:
             # Naive datetime - assume it's in local time and make it aware
-            from django.utils import timezone as django_tz
-            self.current_time = django_tz.make_aware(trip.planned_start_time, timezone=self.timezone)
+            self.current_time = timezone.make_aware(trip.planned_start_time, timezone=self.timezone)
         else:
             # Already aware - convert to local timezone
             self.current_time = trip.planned_start_time.astimezone(self.timezone)
@@ -248,53 +455,78 @@ class RouteGenerationService:
 
         # Step 2: Check feasibility
         if not self._check_feasibility():
+            # No route gets built, but keep the coordinates and the verdict
+            self._save_trip()
             raise ValueError(self.trip.feasibility_message)
 
         # Step 3: Get base route from MapBox
         base_route = self._get_base_route()
         # Step 4: Generate all stops with HOS compliance
         self._generate_stops(base_route)
+        self._resolve_stop_locations()
+
+        # Steps 5-7 write together, a failure part way leaves no half-built route behind
+        with transaction.atomic():
+            # Step 5: Create Route model
+            route = self._create_route(base_route)
 
-        # Step 5: Create Route model
-        route = self._create_route(base_route)
+            # Step 6: Create Stop models
+            self._create_stops(route)
 
-        # Step 6: Create Stop models
-        self._create_stops(route)
+            # Step 7: Generate daily logs
+            self._generate_daily_logs(route)
 
-        # Step 7: Generate daily logs
-        self._generate_daily_logs(route)
+            self._save_trip()
 
         return route
 
-    def _geocode_locations(self):
-        if not self.trip.current_location_latitude:
-            lat, lng = self.mapbox.geocode_address(self.trip.current_location_address)
-            self.trip.current_location_latitude = lat
-            self.trip.current_location_longitude = lng
+    def _save_trip(self):
+        # Everything generation changed on the trip goes out in a single UPDATE
+        if self.trip_update_fields:
+            self.trip.save(update_fields=sorted(self.trip_update_fields | {'updated_at'}))
+            self.trip_update_fields.clear()
 
-        if not self.trip.pickup_location_latitude:
-            lat, lng = self.mapbox.geocode_address(self.trip.pickup_location_address)
-            self.trip.pickup_location_latitude = lat
-            self.trip.pickup_location_longitude = lng
+    def _geocode_locations(self):
+        # Trip locations that still have no coordinates, by field prefix
+        pending = [
+            location for location in ('current_location', 'pickup_location', 'dropoff_location')
+            if not getattr(self.trip, f'{location}_latitude')
+        ]
+        if not pending:
+            return
 
-        if not self.trip.dropoff_location_latitude:
-            lat, lng = self.mapbox.geocode_address(self.trip.dropoff_location_address)
-            self.trip.dropoff_location_latitude = lat
-            self.trip.dropoff_location_longitude = lng
+        # The lookups are independent, run them side by side instead of one round trip after another
+        addresses = [getattr(self.trip, f'{location}_address') for location in pending]
+        results = list(mapbox_executor.map(self.mapbox.geocode_address, addresses))
 
-        self.trip.save()
+        for location, (lat, lng) in zip(pending, results):
+            setattr(self.trip, f'{location}_latitude', lat)
+            setattr(self.trip, f'{location}_longitude', lng)
+            self.trip_update_fields.update((f'{location}_latitude', f'{location}_longitude'))
 
     def _check_feasibility(self) -> bool:
         # TODO: If start time is after his cycle is over, allow it to be feasible
         hours_available = HOSRules.MAX_HOURS_PER_CYCLE - self.trip.current_cycle_hours_used
 
-        waypoints = [
-            (self.trip.current_location_latitude, self.trip.current_location_longitude),
-            (self.trip.pickup_location_latitude, self.trip.pickup_location_longitude),
-            (self.trip.dropoff_location_latitude, self.trip.dropoff_location_longitude)
-        ]
+        # Straight-line distance is a lower bound on the road distance, reject hopeless trips
+        # without a Directions call. The margin keeps borderline trips on the MapBox check.
+        straight_line_miles = (
+            haversine_miles(self.trip.current_location_latitude, self.trip.current_location_longitude,
+                            self.trip.pickup_location_latitude, self.trip.pickup_location_longitude) +
+            haversine_miles(self.trip.pickup_location_latitude, self.trip.pickup_location_longitude,
+                            self.trip.dropoff_location_latitude, self.trip.dropoff_location_longitude)
+        )
+        min_hours = straight_line_miles / HOSRules.AVERAGE_SPEED_MPH
+        if min_hours > hours_available * HOSRules.FEASIBILITY_ESTIMATE_MARGIN:
+            self.trip.is_feasible = False
+            self.trip.feasibility_message = (
+                f"Insufficient hours. Need at least ~{min_hours:.1f}h, "
+                f"but only {hours_available:.1f}h available in cycle."
+            )
+            self.trip_update_fields.update(('is_feasible', 'feasibility_message'))
+            return False
 
-        route_result = self.mapbox.get_route(waypoints)
+        route_result = self._get_base_route()
         duration = route_result['duration_hours']
         if hours_available < route_result['duration_hours']:
             self.trip.is_feasible = False
@@ -302,23 +534,26 @@ class RouteGenerationService:
                 f"Insufficient hours. Need ~{duration:.1f}h, "
                 f"but only {hours_available:.1f}h available in cycle."
             )
-            self.trip.save()
+            self.trip_update_fields.update(('is_feasible', 'feasibility_message'))
             return False
 
         self.trip.is_feasible = True
         self.trip.total_distance_miles = route_result['distance_miles']
         self.trip.estimated_duration_hours = route_result['duration_hours']
-        self.trip.save()
+        self.trip_update_fields.update(('is_feasible', 'total_distance_miles', 'estimated_duration_hours'))
         return True
 
     def _get_base_route(self) -> Dict:
-        waypoints = [
-            (self.trip.current_location_latitude, self.trip.current_location_longitude),
-            (self.trip.pickup_location_latitude, self.trip.pickup_location_longitude),
-            (self.trip.dropoff_location_latitude, self.trip.dropoff_location_longitude)
-        ]
+        # Fetched once, the feasibility check and stop generation use the same route
+        if self.base_route is None:
+            waypoints = [
+                (self.trip.current_location_latitude, self.trip.current_location_longitude),
+                (self.trip.pickup_location_latitude, self.trip.pickup_location_longitude),
+                (self.trip.dropoff_location_latitude, self.trip.dropoff_location_longitude)
+            ]
+            self.base_route = self.mapbox.get_route(waypoints)
 
-        return self.mapbox.get_route(waypoints)
+        return self.base_route
 
     def _generate_stops(self, base_route: Dict):
 
@@ -357,8 +592,16 @@ class RouteGenerationService:
         total_leg_distance = leg_1['distance'] * 0.000621371
         total_leg_duration = leg_1['duration'] / 3600
 
+        # The geometry covers both legs, stops are placed on the pickup -> dropoff part only.
+        # Measure the polyline once, every stop inserted on the leg samples it.
+        # All three points can geocode to the same place, a zero-length route splits at its start
+        route_miles = drive_distance_miles + total_leg_distance
+        leg_1_path = RoutePath.from_geometry(base_route['geometry']).from_fraction(
+            drive_distance_miles / route_miles if route_miles else 0
+        )
+
         self._traverse_route_with_stops(
-            base_route['geometry'],
+            leg_1_path,
             total_leg_distance,
             total_leg_duration
         )
@@ -372,36 +615,42 @@ class RouteGenerationService:
             'description': 'Load delivery (1 hour)'
         })
 
-    def _traverse_route_with_stops(self, geometry: Dict, total_distance: float, total_duration: float):
+    def _traverse_route_with_stops(self, path: RoutePath, total_distance: float, total_duration: float):
+        # HOS limits as locals, the loop below reads them on every pass
+        break_after_hours = HOSRules.REQUIRED_30MIN_BREAK_AFTER_HOURS
+        max_driving_hours = HOSRules.MAX_DRIVING_HOURS_PER_DAY
+        max_on_duty_hours = HOSRules.MAX_ON_DUTY_HOURS_PER_DAY
+        fuel_interval_miles = HOSRules.FUEL_STOP_INTERVAL_MILES
+        average_speed_mph = HOSRules.AVERAGE_SPEED_MPH
 
         distance_remaining = total_distance
         distance_covered_in_leg = 0
 
         while distance_remaining > 0:
-            if self.hours_since_30min_break >= HOSRules.REQUIRED_30MIN_BREAK_AFTER_HOURS:
-                self._insert_break_stop(geometry, distance_covered_in_leg, total_distance, '30min')
+            if self.hours_since_30min_break >= break_after_hours:
+                self._insert_break_stop(path, distance_covered_in_leg, total_distance, '30min')
                 continue
 
-            if (self.daily_driving_hours >= HOSRules.MAX_DRIVING_HOURS_PER_DAY or
-                    self.daily_on_duty_hours >= HOSRules.MAX_ON_DUTY_HOURS_PER_DAY):
-                self._insert_break_stop(geometry, distance_covered_in_leg, total_distance, '10hr')
+            if (self.daily_driving_hours >= max_driving_hours or
+                    self.daily_on_duty_hours >= max_on_duty_hours):
+                self._insert_break_stop(path, distance_covered_in_leg, total_distance, '10hr')
                 continue
 
-            if self.miles_since_fuel >= HOSRules.FUEL_STOP_INTERVAL_MILES:
-                self._insert_fuel_stop(geometry, distance_covered_in_leg, total_distance)
+            if self.miles_since_fuel >= fuel_interval_miles:
+                self._insert_fuel_stop(path, distance_covered_in_leg, total_distance)
                 continue
 
-            hours_until_break = HOSRules.REQUIRED_30MIN_BREAK_AFTER_HOURS - self.hours_since_30min_break
+            hours_until_break = break_after_hours - self.hours_since_30min_break
             hours_until_daily_limit = min(
-                HOSRules.MAX_DRIVING_HOURS_PER_DAY - self.daily_driving_hours,
-                HOSRules.MAX_ON_DUTY_HOURS_PER_DAY - self.daily_on_duty_hours
+                max_driving_hours - self.daily_driving_hours,
+                max_on_duty_hours - self.daily_on_duty_hours
             )
-            miles_until_fuel = HOSRules.FUEL_STOP_INTERVAL_MILES - self.miles_since_fuel
+            miles_until_fuel = fuel_interval_miles - self.miles_since_fuel
 
             hours_can_drive = min(hours_until_break, hours_until_daily_limit)
-            miles_can_drive = min(hours_can_drive * HOSRules.AVERAGE_SPEED_MPH, miles_until_fuel, distance_remaining)
+            miles_can_drive = min(hours_can_drive * average_speed_mph, miles_until_fuel, distance_remaining)
 
-            hours_to_drive = miles_can_drive / HOSRules.AVERAGE_SPEED_MPH
+            hours_to_drive = miles_can_drive / average_speed_mph
 
             self.current_time += timedelta(hours=hours_to_drive)
             self.cumulative_miles += miles_can_drive
@@ -413,23 +662,19 @@ class RouteGenerationService:
             distance_covered_in_leg += miles_can_drive
             distance_remaining -= miles_can_drive
 
-    def _insert_break_stop(self, geometry: Dict, distance_along_leg: float, total_leg_distance: float, break_type: str):
+    def _insert_break_stop(self, path: RoutePath, distance_along_leg: float, total_leg_distance: float, break_type: str):
 
-        # Get location along route
-        lat, lng = self.mapbox.get_point_along_route(geometry, distance_along_leg, total_leg_distance)
-
-        # Find nearest rest area
-        stop_location = self.mapbox.find_nearest_stop_location(lat, lng, 'rest')
+        # Get location along route, the nearest rest area is looked up once planning is done
+        lat, lng = self.mapbox.get_point_along_route(path, distance_along_leg, total_leg_distance)
 
         if break_type == '30min':
             self._add_stop({
                 'type': '30min_break',
-                'address': stop_location['address'],
-                'latitude': stop_location['latitude'],
-                'longitude': stop_location['longitude'],
+                'address': '',
+                'latitude': lat,
+                'longitude': lng,
                 'duration_minutes': HOSRules.BREAK_30MIN_DURATION,
-                'description': 'Mandatory 30-minute break',
-                'place_id': stop_location.get('place_id', '')
+                'description': 'Mandatory 30-minute break'
             })
 
             self.daily_on_duty_hours += HOSRules.BREAK_30MIN_DURATION / 60
@@ -438,12 +683,11 @@ class RouteGenerationService:
         else:  # 10-hour rest
             self._add_stop({
                 'type': '10hr_break',
-                'address': stop_location['address'],
-                'latitude': stop_location['latitude'],
-                'longitude': stop_location['longitude'],
+                'address': '',
+                'latitude': lat,
+                'longitude': lng,
                 'duration_minutes': HOSRules.BREAK_10HR_DURATION,
-                'description': 'Mandatory 10-hour off-duty rest period',
-                'place_id': stop_location.get('place_id', '')
+                'description': 'Mandatory 10-hour off-duty rest period'
             })
 
             # Reset daily counters - new day starts after this rest
@@ -452,46 +696,64 @@ class RouteGenerationService:
             self.daily_on_duty_hours = 0
             self.hours_since_30min_break = 0
 
-    def _insert_fuel_stop(self, geometry: Dict, distance_along_leg: float, total_leg_distance: float):
+        self.pending_locations.append((self.stops[-1], 'rest'))
+
+    def _insert_fuel_stop(self, path: RoutePath, distance_along_leg: float, total_leg_distance: float):
 
-        lat, lng = self.mapbox.get_point_along_route(geometry, distance_along_leg, total_leg_distance)
-        stop_location = self.mapbox.find_nearest_stop_location(lat, lng, 'fuel')
+        lat, lng = self.mapbox.get_point_along_route(path, distance_along_leg, total_leg_distance)
 
         self._add_stop({
             'type': 'fuel',
-            'address': stop_location['address'],
-            'latitude': stop_location['latitude'],
-            'longitude': stop_location['longitude'],
+            'address': '',
+            'latitude': lat,
+            'longitude': lng,
             'duration_minutes': HOSRules.FUEL_STOP_DURATION_MINUTES,
-            'description': 'Refueling stop',
-            'place_id': stop_location.get('place_id', '')
+            'description': 'Refueling stop'
         })
 
         self.miles_since_fuel = 0
+        self.pending_locations.append((self.stops[-1], 'fuel'))
+
+    def _resolve_stop_locations(self):
+        # Where a stop is doesn't change the HOS timing, so every lookup can run at once
+        if not self.pending_locations:
+            return
+
+        def find_location(pending):
+            stop, search_type = pending
+            return self.mapbox.find_nearest_stop_location(stop.latitude, stop.longitude, search_type)
+
+        locations = list(mapbox_executor.map(find_location, self.pending_locations))
+
+        for (stop, _), location in zip(self.pending_locations, locations):
+            stop.address = location['address']
+            stop.latitude = location['latitude']
+            stop.longitude = location['longitude']
+            stop.place_id = location.get('place_id', '')
 
     def _add_stop(self, stop_data: Dict):
         arrival_time = self.current_time
         departure_time = arrival_time + timedelta(minutes=stop_data['duration_minutes'])
 
-        self.stops.append({
-            'sequence': len(self.stops),
-            'stop_type': stop_data['type'],
-            'address': stop_data['address'],
-            'latitude': stop_data['latitude'],
-            'longitude': stop_data['longitude'],
-            'arrival_time': arrival_time,
-            'departure_time': departure_time,
-            'duration_minutes': stop_data['duration_minutes'],
-            'description': stop_data['description'],
-            'place_id': stop_data.get('place_id', ''),
-            'cumulative_miles': self.cumulative_miles
-        })
+        self.stops.append(PlannedStop(
+            sequence=len(self.stops),
+            stop_type=stop_data['type'],
+            address=stop_data['address'],
+            latitude=stop_data['latitude'],
+            longitude=stop_data['longitude'],
+            arrival_time=arrival_time,
+            departure_time=departure_time,
+            duration_minutes=stop_data['duration_minutes'],
+            description=stop_data['description'],
+            place_id=stop_data.get('place_id', ''),
+            cumulative_miles=self.cumulative_miles
+        ))
 
         # Update current_time to departure time
         self.current_time = departure_time
 
         # Update on-duty hours for non-driving activities
-        if stop_data['type'] in ['pickup', 'dropoff', 'fuel']:
+        if stop_data['type'] in ON_DUTY_STOP_TYPES:
             hours = stop_data['duration_minutes'] / 60
             self.daily_on_duty_hours += hours
 
@@ -510,17 +772,20 @@ class RouteGenerationService:
 
     def _create_route(self, base_route: Dict) -> Route:
 
-        total_driving_hours = sum(
-            (s['departure_time'] - s['arrival_time']).total_seconds() / 3600
-            for s in self.stops if s['stop_type'] in ['current', 'pickup', 'dropoff']
-        ) + base_route['duration_hours']
+        # Single pass over the stops for both totals
+        stop_hours = 0
+        on_duty_stop_hours = 0
+        for s in self.stops:
+            stop_type = s.stop_type
+            if stop_type in ROUTE_ENDPOINT_STOP_TYPES:
+                stop_hours += (s.departure_time - s.arrival_time).total_seconds() / 3600
+            if stop_type in ON_DUTY_STOP_TYPES:
+                on_duty_stop_hours += s.duration_minutes / 60
 
-        total_on_duty_hours = total_driving_hours + sum(
-            s['duration_minutes'] / 60
-            for s in self.stops if s['stop_type'] in ['pickup', 'dropoff', 'fuel']
-        )
+        total_driving_hours = stop_hours + base_route['duration_hours']
+        total_on_duty_hours = total_driving_hours + on_duty_stop_hours
 
-        total_duration = (self.stops[-1]['departure_time'] - self.stops[0]['arrival_time']).total_seconds() / 3600
+        total_duration = (self.stops[-1].departure_time - self.stops[0].arrival_time).total_seconds() / 3600
         total_off_duty = total_duration - total_on_duty_hours
 
         route = Route.objects.create(
@@ -537,29 +802,29 @@ class RouteGenerationService:
         return route
 
     def _create_stops(self, route: Route):
-
+        stops = []
         for i, stop_data in enumerate(self.stops):
             miles_from_previous = 0
             if i > 0:
-                miles_from_previous = stop_data['cumulative_miles'] - self.stops[i-1]['cumulative_miles']
+                miles_from_previous = stop_data.cumulative_miles - self.stops[i-1].cumulative_miles
 
-            Stop.objects.create(
+            stops.append(Stop(
                 route=route,
-                sequence=stop_data['sequence'],
-                stop_type=stop_data['stop_type'],
-                address=stop_data['address'],
-                latitude=stop_data['latitude'],
-                longitude=stop_data['longitude'],
-                place_id=stop_data.get('place_id', ''),
-                arrival_time=stop_data['arrival_time'],
-                departure_time=stop_data['departure_time'],
-                duration_minutes=stop_data['duration_minutes'],
-                description=stop_data['description'],
+                sequence=stop_data.sequence,
+                stop_type=stop_data.stop_type,
+                address=stop_data.address,
+                latitude=stop_data.latitude,
+                longitude=stop_data.longitude,
+                place_id=stop_data.place_id,
+                arrival_time=stop_data.arrival_time,
+                departure_time=stop_data.departure_time,
+                duration_minutes=stop_data.duration_minutes,
+                description=stop_data.description,
                 miles_from_previous=miles_from_previous,
-                cumulative_miles=stop_data['cumulative_miles']
-            )
+                cumulative_miles=stop_data.cumulative_miles
+            ))
 
-    from collections import defaultdict
+        Stop.objects.bulk_create(stops)
 
     def _generate_daily_logs(self, route: Route):
         if not self.stops:
@@ -568,27 +833,9 @@ class RouteGenerationService:
         stops_by_date = defaultdict(list)
         drives_by_date = defaultdict(list)
 
-        for i in range(len(self.stops)):
-            stop = self.stops[i]
-            arrival = stop['arrival_time']
-            departure = stop['departure_time']
-            tzinfo = arrival.tzinfo
-
-            start_date = arrival.date()
-            end_date = departure.date()
-
-            current_date = start_date
-            while current_date <= end_date:
-                day_start = datetime.combine(current_date, datetime.min.time())
-                day_end = datetime.combine(current_date, datetime.max.time())
-                if tzinfo:
-                    day_start = day_start.replace(tzinfo=tzinfo)
-                    day_end = day_end.replace(tzinfo=tzinfo)
-
-                day_arrival = max(arrival, day_start)
-                day_departure = min(departure, day_end)
-
-                stops_by_date[current_date].append({
+        for i, stop in enumerate(self.stops):
+            for log_date, day_arrival, day_departure in iter_day_spans(stop.arrival_time, stop.departure_time):
+                stops_by_date[log_date].append({
                     'original_stop': stop,
                     'stop_index': i,
                     'day_arrival': day_arrival,
@@ -596,30 +843,15 @@ class RouteGenerationService:
                     'day_duration_hours': (day_departure - day_arrival).total_seconds() / 3600.0
                 })
 
-                current_date = current_date + timedelta(days=1)
-
             if i > 0:
                 prev_stop = self.stops[i - 1]
-                drive_start = prev_stop['departure_time']
-                drive_end = stop['arrival_time']
+                drive_start = prev_stop.departure_time
+                drive_end = stop.arrival_time
 
                 if drive_end > drive_start:
-                    drive_start_date = drive_start.date()
-                    drive_end_date = drive_end.date()
-
-                    current_date = drive_start_date
-                    while current_date <= drive_end_date:
-                        day_start = datetime.combine(current_date, datetime.min.time())
-                        day_end = datetime.combine(current_date, datetime.max.time())
-                        if tzinfo:
-                            day_start = day_start.replace(tzinfo=tzinfo)
-                            day_end = day_end.replace(tzinfo=tzinfo)
-
-                        day_drive_start = max(drive_start, day_start)
-                        day_drive_end = min(drive_end, day_end)
-
+                    for log_date, day_drive_start, day_drive_end in iter_day_spans(drive_start, drive_end):
                         if day_drive_end > day_drive_start:
-                            drives_by_date[current_date].append({
+                            drives_by_date[log_date].append({
                                 'from_stop_index': i - 1,
                                 'to_stop_index': i,
                                 'day_start': day_drive_start,
@@ -628,33 +860,31 @@ class RouteGenerationService:
                                 'to_stop': stop
                             })
 
-                        current_date = current_date + timedelta(days=1)
-
         sorted_dates = sorted(set(list(stops_by_date.keys()) + list(drives_by_date.keys())))
+        daily_logs = []
+        log_entries = []
         for day_number, log_date in enumerate(sorted_dates, start=1):
-            self._create_daily_log_for_date(
+            daily_log, day_log_entries = self._build_daily_log_for_date(
                 route,
                 day_number,
                 log_date,
                 stops_by_date.get(log_date, []),
                 drives_by_date.get(log_date, [])
             )
+            daily_logs.append(daily_log)
+            log_entries.extend(day_log_entries)
 
-        self.trip.days_required = len(sorted_dates)
-        self.trip.save()
+        # One INSERT for every day's log, then one for all their entries (which pick up the new log ids)
+        DailyLog.objects.bulk_create(daily_logs)
+        LogEntry.objects.bulk_create(log_entries)
 
-    def _create_daily_log_for_date(self, route: Route, day_number: int, log_date, day_stop_info: List[Dict], day_drive_info: List[Dict]):
-        tzinfo = None
-        if day_stop_info:
-            tzinfo = day_stop_info[0]['day_arrival'].tzinfo
-        elif day_drive_info:
-            tzinfo = day_drive_info[0]['day_start'].tzinfo
+        self.trip.days_required = len(sorted_dates)
+        self.trip_update_fields.add('days_required')
 
-        day_start = datetime.combine(log_date, datetime.min.time())
-        day_end = datetime.combine(log_date, datetime.max.time())
-        if tzinfo:
-            day_start = day_start.replace(tzinfo=tzinfo)
-            day_end = day_end.replace(tzinfo=tzinfo)
+    def _build_daily_log_for_date(self, route: Route, day_number: int, log_date, day_stop_info: List[Dict], day_drive_info: List[Dict]) -> Tuple[DailyLog, List[LogEntry]]:
+        # Every planned time is in the service timezone, no need to look it up from the day's stops
+        day_start = datetime.combine(log_date, datetime.min.time(), self.timezone)
+        day_end = datetime.combine(log_date, datetime.max.time(), self.timezone)
 
         day_entries = sorted(day_stop_info, key=lambda x: x['day_arrival'])
 
@@ -667,19 +897,19 @@ class RouteGenerationService:
             drive_duration = (drive['day_end'] - drive['day_start']).total_seconds() / 3600.0
             driving_hours += drive_duration
 
-            global_drive_duration = (drive['to_stop']['arrival_time'] - drive['from_stop']['departure_time']).total_seconds() / 3600.0
+            global_drive_duration = (drive['to_stop'].arrival_time - drive['from_stop'].departure_time).total_seconds() / 3600.0
             if global_drive_duration > 0:
-                drive_distance = drive['to_stop']['cumulative_miles'] - drive['from_stop']['cumulative_miles']
+                drive_distance = drive['to_stop'].cumulative_miles - drive['from_stop'].cumulative_miles
                 total_miles += drive_distance * (drive_duration / global_drive_duration)
 
         for entry in day_entries:
             orig = entry['original_stop']
             stop_duration = entry['day_duration_hours']
-            stype = orig['stop_type']
+            stype = orig.stop_type
 
-            if stype in ['pickup', 'dropoff', 'fuel']:
+            if stype in ON_DUTY_STOP_TYPES:
                 on_duty_not_driving_hours += stop_duration
-            elif stype in ['30min_break', '10hr_break']:
+            elif stype in BREAK_STOP_TYPES:
                 off_duty_hours += stop_duration
             else:
                 off_duty_hours += stop_duration
@@ -687,42 +917,45 @@ class RouteGenerationService:
         total_on_duty_hours = driving_hours + on_duty_not_driving_hours
         total_off_duty_hours = 24.0 - total_on_duty_hours
 
-        daily_log = DailyLog.objects.create(
+        daily_log = DailyLog(
             trip=self.trip,
             day_number=day_number,
             log_date=log_date,
             total_driving_hours=round(driving_hours, 2),
             total_on_duty_hours=round(total_on_duty_hours, 2),
             total_off_duty_hours=round(total_off_duty_hours, 2),
-            start_location=day_entries[0]['original_stop']['address'] if day_entries else 'N/A',
-            end_location=day_entries[-1]['original_stop']['address'] if day_entries else 'N/A',
+            start_location=day_entries[0]['original_stop'].address if day_entries else 'N/A',
+            end_location=day_entries[-1]['original_stop'].address if day_entries else 'N/A',
             total_miles=round(total_miles, 1),
             is_compliant=True
         )
 
-        self._create_log_entries_for_day(daily_log, day_start, day_end, day_entries, day_drive_info)
+        log_entries = self._build_log_entries_for_day(daily_log, day_start, day_end, day_entries, day_drive_info)
 
-    def _create_log_entries_for_day(self, daily_log, day_start, day_end, day_entries, day_drives):
-        entries = []
-        current_time = day_start
+        # Painted before the insert so the grid goes out with the log row
+        daily_log.log_grid_data = get_log_grid(
+            ((entry.start_time, entry.end_time, entry.duty_status) for entry in log_entries),
+            day_start
+        )
 
-        all_events = []
+        return daily_log, log_entries
 
-        for drive in day_drives:
-            all_events.append({
-                'type': 'drive',
-                'time': drive['day_start'],
-                'data': drive
-            })
+    def _build_log_entries_for_day(self, daily_log, day_start, day_end, day_entries, day_drives) -> List[LogEntry]:
+        entries = []
+        current_time = day_start
 
-        for entry in day_entries:
-            all_events.append({
-                'type': 'stop',
-                'time': entry['day_arrival'],
-                'data': entry
-            })
+        drive_events = (
+            {'type': 'drive', 'time': drive['day_start'], 'data': drive}
+            for drive in day_drives
+        )
+        stop_events = (
+            {'type': 'stop', 'time': entry['day_arrival'], 'data': entry}
+            for entry in day_entries
+        )
 
-        all_events.sort(key=lambda x: x['time'])
+        # Both inputs are already in time order, merge them instead of sorting the concatenation.
+        # On equal times the drive comes first, as the stable sort had it.
+        all_events = heapq.merge(drive_events, stop_events, key=itemgetter('time'))
 
         for event in all_events:
             if event['type'] == 'drive':
@@ -733,9 +966,9 @@ class RouteGenerationService:
                         'duty_status': 'off_duty',
                         'start_time': current_time,
                         'end_time': drive['day_start'],
-                        'location': entries[-1]['location'] if entries else drive['from_stop']['address'],
-                        'latitude': entries[-1].get('latitude') if entries else drive['from_stop'].get('latitude'),
-                        'longitude': entries[-1].get('longitude') if entries else drive['from_stop'].get('longitude'),
+                        'location': entries[-1]['location'] if entries else drive['from_stop'].address,
+                        'latitude': entries[-1].get('latitude') if entries else drive['from_stop'].latitude,
+                        'longitude': entries[-1].get('longitude') if entries else drive['from_stop'].longitude,
                         'remarks': 'Off duty'
                     })
                     current_time = drive['day_start']
@@ -744,10 +977,10 @@ class RouteGenerationService:
                     'duty_status': 'driving',
                     'start_time': current_time,
                     'end_time': drive['day_end'],
-                    'location': f"En route to {drive['to_stop']['address']}",
-                    'latitude': drive['to_stop'].get('latitude'),
-                    'longitude': drive['to_stop'].get('longitude'),
-                    'remarks': f"Driving from {drive['from_stop']['address']}"
+                    'location': f"En route to {drive['to_stop'].address}",
+                    'latitude': drive['to_stop'].latitude,
+                    'longitude': drive['to_stop'].longitude,
+                    'remarks': f"Driving from {drive['from_stop'].address}"
                 })
                 current_time = drive['day_end']
 
@@ -762,32 +995,24 @@ class RouteGenerationService:
                         'duty_status': 'off_duty',
                         'start_time': current_time,
                         'end_time': arrival,
-                        'location': entries[-1]['location'] if entries else orig['address'],
-                        'latitude': entries[-1].get('latitude') if entries else orig.get('latitude'),
-                        'longitude': entries[-1].get('longitude') if entries else orig.get('longitude'),
+                        'location': entries[-1]['location'] if entries else orig.address,
+                        'latitude': entries[-1].get('latitude') if entries else orig.latitude,
+                        'longitude': entries[-1].get('longitude') if entries else orig.longitude,
                         'remarks': 'Off duty'
                     })
                     current_time = arrival
 
                 if departure > current_time:
-                    duty_status_map = {
-                        'pickup': 'on_duty',
-                        'dropoff': 'on_duty',
-                        'fuel': 'on_duty',
-                        '30min_break': 'off_duty',
-                        '10hr_break': 'sleeper',
-                        'current': 'off_duty'
-                    }
-                    duty_status = duty_status_map.get(orig['stop_type'], 'off_duty')
+                    duty_status = STOP_DUTY_STATUS.get(orig.stop_type, 'off_duty')
 
                     entries.append({
                         'duty_status': duty_status,
                         'start_time': current_time,
                         'end_time': departure,
-                        'location': orig['address'],
-                        'latitude': orig.get('latitude'),
-                        'longitude': orig.get('longitude'),
-                        'remarks': orig.get('description', '')
+                        'location': orig.address,
+                        'latitude': orig.latitude,
+                        'longitude': orig.longitude,
+                        'remarks': orig.description
                     })
                     current_time = departure
 
@@ -802,6 +1027,7 @@ class RouteGenerationService:
                 'remarks': 'Off duty'
             })
 
+        log_entries = []
         for i, entry_data in enumerate(entries):
             start = entry_data['start_time']
             end = entry_data['end_time']
@@ -821,7 +1047,7 @@ class RouteGenerationService:
 
             duration_min = int((end - start).total_seconds() / 60)
 
-            LogEntry.objects.create(
+            log_entries.append(LogEntry(
                 daily_log=daily_log,
                 duty_status=entry_data['duty_status'],
                 start_time=start,
@@ -831,45 +1057,9 @@ class RouteGenerationService:
                 latitude=entry_data.get('latitude'),
                 longitude=entry_data.get('longitude'),
                 remarks=entry_data.get('remarks', '')
-            )
-
-    def _create_daily_log(self, route: Route, day_number: int, start_time: datetime, end_time: datetime, stops: List[Dict]):
-        driving_hours = 0
-        on_duty_hours = 0
-        off_duty_hours = 0
-        total_miles = 0
-
-        for i, stop in enumerate(stops):
-            duration_hours = stop['duration_minutes'] / 60
+            ))
 
-            if stop['stop_type'] in ['pickup', 'dropoff', 'fuel']:
-                on_duty_hours += duration_hours
-            elif stop['stop_type'] in ['30min_break', '10hr_break']:
-                off_duty_hours += duration_hours
-
-            if i > 0:
-                prev_stop = stops[i-1]
-                drive_time = (stop['arrival_time'] - prev_stop['departure_time']).total_seconds() / 3600
-                driving_hours += drive_time
-                on_duty_hours += drive_time
-                total_miles += stop['cumulative_miles'] - prev_stop['cumulative_miles']
-
-        # Remaining time is off-duty
-        total_day_hours = (end_time - start_time).total_seconds() / 3600
-        off_duty_hours = total_day_hours - on_duty_hours
-
-        DailyLog.objects.create(
-            trip=self.trip,
-            day_number=day_number,
-            log_date=start_time.date(),
-            total_driving_hours=round(driving_hours, 2),
-            total_on_duty_hours=round(on_duty_hours, 2),
-            total_off_duty_hours=round(off_duty_hours, 2),
-            start_location=stops[0]['address'],
-            end_location=stops[-1]['address'],
-            total_miles=round(total_miles, 1),
-            is_compliant=True
-        )
+        return log_entries
 
 
 #  function to call from views
@@ -877,20 +1067,21 @@ def generate_route_for_trip(trip_id: int) -> Route:
 
     try:
         trip = Trip.objects.get(id=trip_id)
+    except Trip.DoesNotExist:
+        raise ValueError(f"Trip {trip_id} not found")
+
+    try:
         service = RouteGenerationService(trip)
         route = service.generate_route()
 
         trip.status = 'planning'
-        trip.save()
+        trip.save(update_fields=['status', 'updated_at'])
 
         return route
 
-    except Trip.DoesNotExist:
-        raise ValueError(f"Trip {trip_id} not found")
     except Exception as e:
-        # Log error and update trip
-        trip = Trip.objects.get(id=trip_id)
+        # Log error and update trip, only these columns are written so nothing half-planned is saved
         trip.is_feasible = False
         trip.feasibility_message = f"Error generating route: {str(e)}"
-        trip.save()
-        raise
\ No newline at end of file
+        trip.save(update_fields=['is_feasible', 'feasibility_message', 'updated_at'])
+        raise
@@ -1,3 +1,232 @@
-from django.test import TestCase
+from datetime import datetime
+from unittest import mock
+import random
+import zoneinfo
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from trips.models import Trip
+from routes import services
+from routes.models import Route
+from routes.services import RoutePath, decode_polyline, generate_route_for_trip, haversine_miles
+
+
+def straight_route(waypoints, points_per_leg=40):
+    # A fake MapBox route: straight segments between the (lat, lng) waypoints,
+    # leg distances measured along them and driven at 50 mph
+    coordinates = [[waypoints[0][1], waypoints[0][0]]]
+    legs = []
+    for (lat1, lng1), (lat2, lng2) in zip(waypoints, waypoints[1:]):
+        miles = haversine_miles(lat1, lng1, lat2, lng2)
+        legs.append({'distance': miles / 0.000621371, 'duration': miles / 50 * 3600})
+        for i in range(1, points_per_leg + 1):
+            coordinates.append([
+                lng1 + (lng2 - lng1) * i / points_per_leg,
+                lat1 + (lat2 - lat1) * i / points_per_leg
+            ])
+
+    return {
+        'distance_miles': sum(leg['distance'] for leg in legs) * 0.000621371,
+        'duration_hours': sum(leg['duration'] for leg in legs) / 3600,
+        'geometry': {'type': 'LineString', 'coordinates': coordinates},
+        'legs': legs
+    }
+
+
+def encode_polyline(coordinates, precision):
+    # Reference encoder for [lng, lat] points: zigzag varint (lat, lng) deltas
+    factor = 10 ** precision
+    chunks = []
+    prev_lat = prev_lng = 0
+    for lng, lat in coordinates:
+        lat, lng = round(lat * factor), round(lng * factor)
+        for delta in (lat - prev_lat, lng - prev_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        prev_lat, prev_lng = lat, lng
+    return ''.join(chunks)
+
+
+class DecodePolylineTests(SimpleTestCase):
+
+    def test_known_polyline(self):
+        # The example from Google's polyline algorithm documentation
+        self.assertEqual(
+            decode_polyline('_p~iF~ps|U_ulLnnqC_mqNvxq`@'),
+            [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+        )
+
+    def test_round_trip(self):
+        rng = random.Random(0)
+        coordinates = [[rng.uniform(-180, 180), rng.uniform(-90, 90)] for _ in range(400)]
+
+        for precision in (5, 6):
+            with self.subTest(precision=precision):
+                decoded = decode_polyline(encode_polyline(coordinates, precision), precision=precision)
+
+                # Points come back as the encoder rounded them, to 1e-precision
+                factor = 10 ** precision
+                self.assertEqual(len(decoded), len(coordinates))
+                for (lng, lat), (expected_lng, expected_lat) in zip(decoded, coordinates):
+                    self.assertAlmostEqual(lng, round(expected_lng * factor) / factor, places=9)
+                    self.assertAlmostEqual(lat, round(expected_lat * factor) / factor, places=9)
+
+    def test_empty(self):
+        self.assertEqual(decode_polyline(''), [])
+
+
+class RoutePathTests(SimpleTestCase):
+
+    def test_from_geometry_measures_the_polyline(self):
+        path = RoutePath.from_geometry({'coordinates': [[0, 0], [1, 0], [2, 0]]})
+
+        self.assertEqual(path.cumulative_miles[0], 0)
+        self.assertAlmostEqual(path.cumulative_miles[1], haversine_miles(0, 0, 0, 1))
+        self.assertAlmostEqual(path.cumulative_miles[2], 2 * path.cumulative_miles[1])
+
+    def test_from_fraction_rebases_distances(self):
+        path = RoutePath.from_geometry({'coordinates': [[0, 0], [1, 0], [2, 0], [3, 0]]})
+        rest = path.from_fraction(1 / 3)
+
+        self.assertEqual(rest.coordinates, [[1, 0], [2, 0], [3, 0]])
+        self.assertEqual(rest.cumulative_miles[0], 0)
+        self.assertAlmostEqual(rest.cumulative_miles[-1], path.cumulative_miles[-1] - path.cumulative_miles[1])
+
+    def test_from_fraction_of_zero_length_path(self):
+        path = RoutePath.from_geometry({'coordinates': [[5, 5], [5, 5]]})
+
+        rest = path.from_fraction(0)
+        self.assertEqual(rest.coordinates[-1], [5, 5])
+        self.assertEqual(rest.cumulative_miles[-1], 0)
+
+    def test_get_point_along_route_interpolates(self):
+        path = RoutePath.from_geometry({'coordinates': [[0, 0], [2, 0]]})
+        mapbox = services.mapbox_service
+
+        self.assertEqual(mapbox.get_point_along_route(path, 0, 100), (0, 0))
+        self.assertEqual(mapbox.get_point_along_route(path, 100, 100), (0, 2))
+        lat, lng = mapbox.get_point_along_route(path, 25, 100)
+        self.assertEqual(lat, 0)
+        self.assertAlmostEqual(lng, 0.5)
+
+
+class RouteGenerationTests(TestCase):
+
+    def create_trip(self):
+        return Trip.objects.create(
+            trip_name='Test trip',
+            current_location_address='Current',
+            pickup_location_address='Pickup',
+            dropoff_location_address='Dropoff',
+            current_cycle_hours_used=0,
+            planned_start_time=datetime(2025, 1, 1, 6, 0, tzinfo=zoneinfo.ZoneInfo('UTC'))
+        )
+
+    def generate(self, locations):
+        mapbox = services.mapbox_service
+        with mock.patch.object(mapbox, 'geocode_address', side_effect=locations.__getitem__), \
+                mock.patch.object(mapbox, 'get_route', side_effect=straight_route), \
+                mock.patch.object(mapbox, 'find_nearest_stop_location', side_effect=lambda lat, lng, stop_type: {
+                    'address': stop_type, 'latitude': lat, 'longitude': lng, 'place_id': ''
+                }):
+            return generate_route_for_trip(self.create_trip().id)
+
+    def test_zero_length_route(self):
+        # Current, pickup and dropoff all geocode to the same place
+        route = self.generate({'Current': (31.95, 35.93), 'Pickup': (31.95, 35.93), 'Dropoff': (31.95, 35.93)})
+
+        self.assertEqual(route.total_distance_miles, 0)
+        self.assertEqual(
+            list(route.stops.values_list('stop_type', flat=True)),
+            ['current', 'pickup', 'dropoff']
+        )
+
+    def test_en_route_stops_are_placed_after_pickup(self):
+        # A long pickup -> dropoff leg along the equator, breaks and fuel stops must not land on
+        # the current -> pickup part of the geometry
+        route = self.generate({'Current': (0, 0), 'Pickup': (0, 5), 'Dropoff': (0, 30)})
+
+        en_route_stops = route.stops.exclude(stop_type__in=['current', 'pickup', 'dropoff'])
+        self.assertTrue(en_route_stops.exists())
+        for stop in en_route_stops:
+            self.assertGreater(stop.longitude, 5)
+
+
+class RouteGeometryEndpointTests(TestCase):
+
+    def setUp(self):
+        trip = Trip.objects.create(
+            trip_name='Test trip',
+            current_location_address='Current',
+            pickup_location_address='Pickup',
+            dropoff_location_address='Dropoff',
+            current_cycle_hours_used=0
+        )
+        self.geometry = {'type': 'LineString', 'coordinates': [[35.93, 31.95], [36.0, 32.0]]}
+        self.route = Route.objects.create(
+            trip=trip, total_distance_miles=10, total_duration_hours=1,
+            total_driving_hours=1, total_on_duty_hours=1, total_off_duty_hours=0,
+            mapbox_route_geometry=self.geometry
+        )
+
+    def test_existing_route(self):
+        response = self.client.get(f'/api/routes/{self.route.pk}/geometry/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.geometry)
+
+    def test_missing_route(self):
+        response = self.client.get(f'/api/routes/{self.route.pk + 1}/geometry/')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_non_numeric_pk(self):
+        response = self.client.get('/api/routes/abc/geometry/')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class StopLocationSearchTests(SimpleTestCase):
+
+    def test_non_json_response_falls_back_to_the_next_query(self):
+        html = mock.Mock(status_code=200, content=b'<html>Bad gateway</html>')
+        poi = mock.Mock(status_code=200, content=b'{"features": [{"geometry": {"coordinates": [36.0, 32.0]}, '
+                                                 b'"place_name": "Truck Stop", "id": "poi.1"}]}')
+        mapbox = services.mapbox_service
+
+        with mock.patch.object(mapbox.session, 'get', side_effect=[html, poi]):
+            location = mapbox._search_stop_location(31.95, 35.93, 'rest')
+
+        self.assertEqual(location, {'address': 'Truck Stop', 'latitude': 32.0, 'longitude': 36.0, 'place_id': 'poi.1'})
+
+    def test_non_json_responses_fall_back_to_the_estimate(self):
+        html = mock.Mock(status_code=200, content=b'<html>Bad gateway</html>')
+        mapbox = services.mapbox_service
+
+        with mock.patch.object(mapbox.session, 'get', return_value=html), \
+                mock.patch.object(services.cache, 'get', return_value=None):
+            location = mapbox.find_nearest_stop_location(31.95, 35.93, 'fuel')
+
+        self.assertEqual(location['latitude'], 31.95)
+        self.assertEqual(location['longitude'], 35.93)
+
+
+class MapBoxSessionTests(SimpleTestCase):
+
+    def test_retries_ignore_retry_after(self):
+        # A large Retry-After on a 429 mustn't stall the request thread
+        retry = services.mapbox_service.session.get_adapter('https://api.mapbox.com').max_retries
+
+        self.assertFalse(retry.respect_retry_after_header)
+        self.assertIn(429, retry.status_forcelist)
+
+    def test_threads_share_the_connection_pool(self):
+        mapbox = services.mapbox_service
+        worker_session = services.mapbox_executor.submit(lambda: mapbox.session).result()
+
+        self.assertIsNot(worker_session, mapbox.session)
+        self.assertIs(worker_session.get_adapter('https://api.mapbox.com'), mapbox.adapter)
+        self.assertIs(mapbox.session.get_adapter('https://api.mapbox.com'), mapbox.adapter)
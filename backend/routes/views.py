@@ -1,4 +1,6 @@
 from rest_framework import viewsets
+from rest_framework.generics import get_object_or_404
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Route, Stop
 from .serializers import RouteDetailSerializer, StopSerializer
@@ -8,11 +10,19 @@ class RouteViewSet(viewsets.ReadOnlyModelViewSet):
     """
     - GET /api/routes/ - List all routes
     - GET /api/routes/{id}/ - Get route details with stops
+    - GET /api/routes/{id}/geometry/ - Get the MapBox GeoJSON geometry
     """
 
-    queryset = Route.objects.all().select_related('trip').prefetch_related('stops')
+    # The geometry blob is only served by the geometry action
+    queryset = Route.objects.all().select_related('trip').prefetch_related('stops').defer('mapbox_route_geometry')
     serializer_class = RouteDetailSerializer
 
+    @action(detail=True, methods=['get'])
+    def geometry(self, request, pk=None):
+        # Read just the one column, without the trip join or stop prefetch
+        geometry = get_object_or_404(Route.objects.values_list('mapbox_route_geometry', flat=True), pk=pk)
+        return Response(geometry)
+
 
 class StopViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -20,5 +30,5 @@ class StopViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /api/stops/{id}/ - Get stop details
     """
 
-    queryset = Stop.objects.all().select_related('route')
+    queryset = Stop.objects.all()
     serializer_class = StopSerializer
\ No newline at end of file
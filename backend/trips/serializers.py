@@ -1,13 +1,12 @@
 from rest_framework import serializers
+from core.serializers import CachedFieldsMixin
 from .models import Trip
-from routes.models import Route, Stop
-from logs.models import DailyLog, LogEntry
 
 from logs.serializers import DailyLogListSerializer
 from routes.serializers import RouteSerializer
 
 
-class TripListSerializer(serializers.ModelSerializer):
+class TripListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Trip
@@ -37,7 +36,7 @@ class TripListSerializer(serializers.ModelSerializer):
         ]
 
 
-class TripCreateSerializer(serializers.ModelSerializer):
+class TripCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Trip
@@ -55,7 +54,7 @@ class TripCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Cycle hours must be between 0 and 70")
         return value
 
-class TripDetailSerializer(serializers.ModelSerializer):
+class TripDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Complete trip details with route and logs"""
     route = RouteSerializer(read_only=True)
     daily_logs = DailyLogListSerializer(many=True, read_only=True)
@@ -1,34 +1,42 @@
 import json
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
 from typing import List
 
-with open("/home/osama/IdeaProjects/trucking-partner/backend/sample_response.json") as routes_response:
-    res = json.loads(routes_response.read())
-duration_array = res['routes'][0]['legs'][0]['annotation']['duration']
-distance_array = res['routes'][0]['legs'][0]['annotation']['distance']
-print(sum(duration_array))
-print(sum(distance_array))
+SAMPLE_RESPONSE_PATH = Path(__file__).resolve().parent.parent / 'sample_response.json'
 
 
-def get_fuel_stop_indices(distance_arr: List[int], distance_threshold: int):
-    curr_distance = 0
-    fuel_stop_indices = []
-    for i in range(len(distance_arr)):
-        curr_distance += distance_arr[i]
-        if curr_distance > distance_threshold:
-            fuel_stop_indices.append(i)
-            curr_distance = 0
-    return fuel_stop_indices
+def _load_sample(path: Path = SAMPLE_RESPONSE_PATH):
+    with open(path) as routes_response:
+        return json.load(routes_response)
 
-def get_rest_stop_indices(duration_arr: List[int], duration_threshold: int):
-    curr_distance = 0
-    rest_stop_indices = []
-    for i in range(len(duration_arr)):
-        curr_distance += duration_arr[i]
-        if curr_distance > duration_threshold:
-            rest_stop_indices.append(i)
-            curr_distance = 0
-    return rest_stop_indices
 
+def _get_threshold_indices(values: List[float], threshold: float) -> List[int]:
+    # Indices where the running total first exceeds the total at the previous pick by
+    # more than threshold. Running totals are non-decreasing, so each next crossing is a
+    # binary search past the previous one instead of an add per element. Distances are
+    # compared on the prefix sums, so for floats a crossing that sits right on the
+    # threshold can land one index away from re-summing from zero after each pick
+    running_totals = list(accumulate(values))
+    indices = []
+    i = bisect_right(running_totals, threshold)
+    while i < len(running_totals):
+        indices.append(i)
+        i = bisect_right(running_totals, running_totals[i] + threshold, i + 1)
+    return indices
 
 
+def get_fuel_stop_indices(distance_arr: List[float], distance_threshold: float):
+    return _get_threshold_indices(distance_arr, distance_threshold)
 
+def get_rest_stop_indices(duration_arr: List[float], duration_threshold: float):
+    return _get_threshold_indices(duration_arr, duration_threshold)
+
+
+if __name__ == '__main__':
+    res = _load_sample()
+    duration_array = res['routes'][0]['legs'][0]['annotation']['duration']
+    distance_array = res['routes'][0]['legs'][0]['annotation']['distance']
+    print(sum(duration_array))
+    print(sum(distance_array))
@@ -1,3 +1,67 @@
-from django.test import TestCase
+import random
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from trips.stop_extractor import get_fuel_stop_indices, get_rest_stop_indices
+
+
+def reset_loop_indices(values, threshold):
+    # The loop the stop extractor used before switching to prefix sums: re-sum from zero
+    # after every pick
+    indices = []
+    current = 0
+    for i in range(len(values)):
+        current += values[i]
+        if current > threshold:
+            indices.append(i)
+            current = 0
+    return indices
+
+
+class StopIndicesTests(SimpleTestCase):
+
+    def test_picks_after_the_threshold_is_exceeded(self):
+        self.assertEqual(get_fuel_stop_indices([5, 5, 5, 5, 5], 8), [1, 3])
+        # Reaching the threshold exactly isn't enough
+        self.assertEqual(get_fuel_stop_indices([4, 4, 4, 4], 8), [2])
+
+    def test_no_picks(self):
+        self.assertEqual(get_rest_stop_indices([], 10), [])
+        self.assertEqual(get_rest_stop_indices([1.5, 2.5], 10), [])
+
+    def test_one_value_larger_than_the_threshold(self):
+        self.assertEqual(get_fuel_stop_indices([1, 50, 1, 1], 10), [1])
+
+    def test_integer_values_match_the_reset_loop(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            values = [rng.randint(0, 30) for _ in range(rng.randint(0, 200))]
+            threshold = rng.randint(10, 200)
+            self.assertEqual(get_fuel_stop_indices(values, threshold), reset_loop_indices(values, threshold))
+
+    def test_float_values_match_the_reset_loop_up_to_threshold_ties(self):
+        # MapBox annotations come rounded to a decimal place, so legs that sum to exactly the
+        # threshold are common and the two float roundings get exercised
+        rng = random.Random(0)
+        for _ in range(500):
+            values = [round(rng.uniform(0, 30), 1) for _ in range(rng.randint(0, 200))]
+            threshold = round(rng.uniform(10, 200), 1)
+            indices = get_fuel_stop_indices(values, threshold)
+
+            # Each pick is checked against the reset loop started right after the previous one,
+            # so a pick that moved doesn't shift every pick after it too
+            start = 0
+            for index in indices + [None]:
+                expected = reset_loop_indices(values[start:], threshold)[:1]
+                if index is None:
+                    if expected:
+                        self.assertAlmostEqual(sum(values[start:start + expected[0] + 1]), threshold)
+                    break
+
+                expected_index = start + expected[0] if expected else len(values)
+                if index != expected_index:
+                    # Summed from zero or taken off the prefix sums, a leg that adds up to the
+                    # threshold can round either side of it: the pick moves by one index, no more
+                    self.assertEqual(abs(index - expected_index), 1)
+                    self.assertAlmostEqual(sum(values[start:min(index, expected_index) + 1]), threshold)
+                start = index + 1
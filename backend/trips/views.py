@@ -1,9 +1,11 @@
+from django.db import transaction
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
 
 from .models import Trip
+from routes.models import Route
 from .serializers import (
     TripListSerializer,
     TripCreateSerializer,
@@ -13,10 +15,21 @@ from routes.services import generate_route_for_trip
 import logging
 logger = logging.getLogger(__name__)
 
+
+class TripPagination(CursorPagination):
+    # Opt in with ?page_size=N, without it the list stays a plain array as the frontend expects.
+    # Keyset pagination on the created_at index, no OFFSET scans on deep pages
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+
+
 class TripViewSet(viewsets.ModelViewSet):
     """
     Endpoints:
     - GET /api/trips/ - List all trips
+    - GET /api/trips/?page_size={n} - List trips a page at a time (cursor paginated)
     - POST /api/trips/ - Create a new trip
     - GET /api/trips/{id}/ - Get trip details
     - PUT/PATCH /api/trips/{id}/ - Update trip
@@ -24,6 +37,10 @@ class TripViewSet(viewsets.ModelViewSet):
     - POST /api/trips/{id}/generate_route/ - Generate route for trip
     """
     queryset = Trip.objects.all()
+    pagination_class = TripPagination
+
+    # Columns TripListSerializer actually reads
+    LIST_FIELDS = TripListSerializer.Meta.fields
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -33,6 +50,22 @@ class TripViewSet(viewsets.ModelViewSet):
         else:
             return TripDetailSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # The list view skips the coordinates, start time and updated_at
+        if self.action == 'list':
+            queryset = queryset.only(*self.LIST_FIELDS)
+
+        # The detail view nests the route with its stops and the daily logs, load them up front.
+        # The route's geometry isn't part of it (served by /api/routes/{id}/geometry/)
+        elif self.action == 'retrieve':
+            queryset = queryset.select_related('route').defer(
+                'route__mapbox_route_geometry'
+            ).prefetch_related('route__stops', 'daily_logs')
+
+        return queryset
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -47,30 +80,37 @@ class TripViewSet(viewsets.ModelViewSet):
         logger.info(f"=== GENERATE ROUTE CALLED for trip {pk} ===")
         trip = self.get_object()
 
-        # Check if route already exists
-        if hasattr(trip, 'route'):
-            return Response(
-                {'error': 'Route already exists for this trip. Delete it first to regenerate.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        try:
-            # Generate the route
-            logger.info(f"Trip found: {trip.trip_name}")
-            logger.info(f"Starting route generation...")
-            route = generate_route_for_trip(trip.id)
-
-            # Return the updated trip with route
-            serializer = TripDetailSerializer(trip)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-        except ValueError as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to generate route: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+        # Hold the trip's row until generation is done, so a second request for the same trip
+        # waits and then sees the route instead of repeating the MapBox calls and failing on insert.
+        # Errors are turned into responses inside the block, so the failure recorded on the trip commits
+        with transaction.atomic():
+            trip = Trip.objects.select_for_update().get(pk=trip.pk)
+
+            # Check if route already exists. An EXISTS query instead of hasattr(), which would load
+            # the whole route row and leave a cached "no route" on the trip serialized below
+            if Route.objects.filter(trip_id=trip.id).exists():
+                return Response(
+                    {'error': 'Route already exists for this trip. Delete it first to regenerate.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            try:
+                # Generate the route
+                logger.info(f"Trip found: {trip.trip_name}")
+                logger.info(f"Starting route generation...")
+                route = generate_route_for_trip(trip.id)
+
+                # Return the updated trip with route, route.trip is the instance generation updated
+                serializer = TripDetailSerializer(route.trip)
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+            except ValueError as e:
+                return Response(
+                    {'error': str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            except Exception as e:
+                return Response(
+                    {'error': f'Failed to generate route: {str(e)}'},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
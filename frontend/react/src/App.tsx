@@ -57,19 +57,10 @@ export interface DailyLog {
     start_location: string;
     end_location: string;
     total_miles: number;
-    entries: LogEntry[];
+    log_grid_data: DutyStatus[] | null;
 }
 
-interface LogEntry {
-    id: number;
-    duty_status: 'off_duty' | 'sleeper' | 'driving' | 'on_duty';
-    duty_status_display: string;
-    start_time: string;
-    end_time: string;
-    duration_minutes: number;
-    location: string;
-    remarks: string;
-}
+type DutyStatus = 'off_duty' | 'sleeper' | 'driving' | 'on_duty';
 
 
 
@@ -127,8 +118,8 @@ function App() {
 
             const logs = await response.json();
             console.log('Daily logs fetched:', logs);
-            console.log('First log entries:', logs[0]?.entries);
-            console.log('Second log entries:', logs[1]?.entries);
+            console.log('First log grid:', logs[0]?.log_grid_data);
+            console.log('Second log grid:', logs[1]?.log_grid_data);
             setDailyLogs(logs);
         } catch (error) {
             console.error('Failed to fetch daily logs:', error);
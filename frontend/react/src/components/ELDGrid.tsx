@@ -31,46 +31,15 @@ export const ELDGrid: React.FC<{ log: DailyLog }> = ({ log }) => {
         }
     };
 
-    const slots = Array(96).fill(null).map(() => ({
-        status: null as string | null,
-        overlapMinutes: 0
-    }));
-
-    if (log.entries && log.entries.length > 0) {
-        log.entries.forEach(entry => {
-            const startTime = new Date(entry.start_time);
-            const endTime = new Date(entry.end_time);
-
-            const startMinutes = startTime.getHours() * 60 + startTime.getMinutes();
-            const endMinutes = endTime.getHours() * 60 + endTime.getMinutes();
-
-            const startSlot = Math.floor(startMinutes / 15);
-            const endSlot = Math.ceil(endMinutes / 15);
-
-            for (let slot = startSlot; slot < endSlot && slot < 96; slot++) {
-                const slotStartMinutes = slot * 15;
-                const slotEndMinutes = (slot + 1) * 15;
-
-                const overlapStart = Math.max(startMinutes, slotStartMinutes);
-                const overlapEnd = Math.min(endMinutes, slotEndMinutes);
-                const overlapMinutes = overlapEnd - overlapStart;
-
-                if (overlapMinutes > 0 && overlapMinutes > slots[slot].overlapMinutes) {
-                    slots[slot] = {
-                        status: entry.duty_status,
-                        overlapMinutes: overlapMinutes
-                    };
-                }
-            }
-        });
-    }
+    // 96 duty statuses (15-minute slots) painted by the backend when the log is generated
+    const slots: (string | null)[] = log.log_grid_data ?? Array(intervals).fill(null);
 
     const gridData: Array<{status: string, intervalStart: number, intervalEnd: number}> = [];
     let currentStatus = null;
     let currentStart = 0;
 
     for (let i = 0; i < 96; i++) {
-        if (slots[i].status !== currentStatus) {
+        if (slots[i] !== currentStatus) {
             if (currentStatus !== null) {
                 gridData.push({
                     status: currentStatus,
@@ -78,7 +47,7 @@ export const ELDGrid: React.FC<{ log: DailyLog }> = ({ log }) => {
                     intervalEnd: i
                 });
             }
-            currentStatus = slots[i].status;
+            currentStatus = slots[i];
             currentStart = i;
         }
     }